@@ -2,3 +2,19 @@ CREATE TABLE IF NOT EXISTS dummy (
     id INT AUTO_INCREMENT PRIMARY KEY,
     timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
+
+-- Event IDs are time-ordered ULIDs, so the clustered primary key doubles as
+-- a time index and point operations are single B-tree lookups.
+CREATE TABLE IF NOT EXISTS events (
+    id CHAR(26) CHARACTER SET ascii COLLATE ascii_bin NOT NULL,
+    timestamp DATETIME(6) NOT NULL,
+    message VARCHAR(255) NOT NULL,
+    severity VARCHAR(32) NOT NULL,
+    event_type VARCHAR(32) NOT NULL,
+    source_name VARCHAR(64) NOT NULL,
+    source_ip VARCHAR(45) NOT NULL,
+    location_country VARCHAR(64) NOT NULL,
+    location_city VARCHAR(64) NOT NULL,
+    PRIMARY KEY (id),
+    INDEX idx_events_timestamp (timestamp)
+) ENGINE=InnoDB;
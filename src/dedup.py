@@ -0,0 +1,106 @@
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from typing import List, Dict, Optional, Tuple
+
+from src.influx.models import Event
+
+
+class IdempotencyKeyMismatch(ValueError):
+    pass
+
+
+class IngestDeduplicator:
+    """
+    Remembers recently accepted event IDs and Idempotency-Key responses for one backend.
+
+    This is the in-process fast path: it skips the write for a retry that reaches the
+    same worker. Event IDs are derived from the event content, so retries that reach
+    another worker, or come after an entry expired, are still caught by the database
+    key. Each worker has its own cache, so deletes and clears only reach the cache of
+    the worker that served them; the window is kept short to bound how long other
+    workers drop re-sent events.
+    """
+
+    def __init__(self, window: Optional[float] = None, capacity: Optional[int] = None):
+        self.window = window if window is not None else float(os.getenv('INGEST_DEDUP_WINDOW', '60'))
+        self.capacity = capacity if capacity is not None else int(os.getenv('INGEST_DEDUP_CAPACITY', '100000'))
+
+        # event ID -> accepted at
+        self.accepted: "OrderedDict[str, float]" = OrderedDict()
+        # Idempotency-Key -> (accepted at, payload fingerprint, response)
+        self.responses: "OrderedDict[str, Tuple[float, bytes, Dict]]" = OrderedDict()
+
+        self.stats = {"duplicates_dropped": 0, "idempotent_replays": 0, "idempotency_key_mismatches": 0}
+
+    @staticmethod
+    def fingerprint(events: List[Event]) -> bytes:
+        """
+        Fingerprint a payload by its event IDs, which are derived from the content.
+        """
+        return hashlib.blake2b("\n".join(event.id for event in events).encode(), digest_size=16).digest()
+
+    def reset(self):
+        """
+        Forget accepted events, e.g. after they were cleared from the database. Counters are kept.
+        """
+        self.accepted.clear()
+        self.responses.clear()
+
+    def forget(self, event_id: str):
+        """
+        Forget one accepted event, e.g. after it was deleted, so it can be written again.
+        """
+        self.accepted.pop(event_id.upper(), None)
+
+    def expire(self):
+        deadline = time.monotonic() - self.window
+        while self.accepted and (next(iter(self.accepted.values())) < deadline or len(self.accepted) > self.capacity):
+            self.accepted.popitem(last=False)
+        while self.responses and (next(iter(self.responses.values()))[0] < deadline
+                                  or len(self.responses) > self.capacity):
+            self.responses.popitem(last=False)
+
+    def replay(self, idempotency_key: Optional[str], fingerprint: bytes) -> Optional[Dict]:
+        """
+        Return the stored response for an Idempotency-Key that was already accepted.
+        Raises IdempotencyKeyMismatch when the key was used for a different payload.
+        """
+        if not idempotency_key:
+            return None
+        self.expire()
+        entry = self.responses.get(idempotency_key)
+        if entry is None:
+            return None
+        if entry[1] != fingerprint:
+            self.stats["idempotency_key_mismatches"] += 1
+            raise IdempotencyKeyMismatch(f"Idempotency-Key {idempotency_key} was used for a different payload")
+        self.stats["idempotent_replays"] += 1
+        return entry[2]
+
+    def filter_new(self, events: List[Event]) -> Tuple[List[Event], int]:
+        """
+        Split out events whose IDs were already accepted; return the new events and the
+        number of duplicates.
+        """
+        self.expire()
+        new_events = [event for event in events if event.id not in self.accepted]
+        duplicates = len(events) - len(new_events)
+        self.stats["duplicates_dropped"] += duplicates
+        return new_events, duplicates
+
+    def accept(self, events: List[Event], idempotency_key: Optional[str] = None,
+               fingerprint: Optional[bytes] = None, response: Optional[Dict] = None):
+        """
+        Record successfully written events, and the response for their Idempotency-Key.
+        """
+        now = time.monotonic()
+        for event in events:
+            self.accepted[event.id] = now
+            self.accepted.move_to_end(event.id)
+
+        if idempotency_key and response is not None:
+            self.responses[idempotency_key] = (now, fingerprint, response)
+            self.responses.move_to_end(idempotency_key)
+        self.expire()
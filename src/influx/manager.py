@@ -1,11 +1,14 @@
 import os
-from datetime import datetime, timedelta
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
 from fastapi import HTTPException
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from influxdb_client import InfluxDBClient, Point
-from influxdb_client.client.write_api import SYNCHRONOUS
+from influxdb_client.client.write_api import SYNCHRONOUS, WriteOptions
 
-from src.influx.models import Event
+from src.influx.models import Event, Utilities
+
+SERIES_TAGS = ["severity", "event_type", "source_name", "source_ip", "location_country", "location_city"]
 
 class InfluxDBManager:
     def get_influxdb_client(self):
@@ -27,14 +30,36 @@ class InfluxDBManager:
 
     def __init__(self):
         self.client = self.get_influxdb_client()
-        self.write_api = self.client.write_api(write_options=SYNCHRONOUS)
+        # INFLUXDB_WRITE_BATCH_SIZE > 0 buffers writes in a background batching writer;
+        # the default keeps writes synchronous so measured durations include the write.
+        batch_size = int(os.getenv('INFLUXDB_WRITE_BATCH_SIZE', '0'))
+        if batch_size > 0:
+            write_options = WriteOptions(
+                batch_size=batch_size,
+                flush_interval=int(os.getenv('INFLUXDB_WRITE_FLUSH_INTERVAL', '1000'))
+            )
+        else:
+            write_options = SYNCHRONOUS
+        self.write_api = self.client.write_api(write_options=write_options)
         self.bucket = os.getenv('INFLUXDB_BUCKET')
         self.delete_api = self.client.delete_api()
+        # Bounded ID -> (timestamp, series tags) index. Misses fall back to the
+        # millisecond window encoded in the ID itself.
+        self.event_index: "OrderedDict[str, Tuple[datetime, Dict[str, str]]]" = OrderedDict()
+        self.event_index_size = int(os.getenv('INFLUXDB_EVENT_INDEX_SIZE', '100000'))
+
+    def close(self):
+        """
+        Flush any buffered writes and release the client.
+        """
+        self.write_api.close()
+        self.client.close()
 
     def write_event(self, event: Event) -> bool:
         try:
             point = self.create_event_point(event)
             self.write_api.write(bucket=self.bucket, org=self.client.org, record=point)
+            self.index_event(event)
             return True
         except Exception as e:
             print(f"Error writing to InfluxDB: {e}")
@@ -47,12 +72,15 @@ class InfluxDBManager:
             points.append(point)
         try:
             self.write_api.write(bucket=self.bucket, org=self.client.org, record=points)
+            for event in events:
+                self.index_event(event)
             return True
         except Exception as e:
             print(f"Error writing to InfluxDB: {e}")
             return False
 
     def create_event_point(self, event: Event):
+        event_id = Utilities.ensure_event_id(event)
         point = Point("events").time(event.timestamp)
         point.tag("severity", event.severity.name)
         point.tag("event_type", event.event_type.name)
@@ -61,9 +89,46 @@ class InfluxDBManager:
         point.tag("location_country", event.source.location.country)
         point.tag("location_city", event.source.location.city)
         point.field("message", event.message)
+        point.field("event_id", event_id)
 
         return point
 
+    def index_event(self, event: Event):
+        self.event_index[event.id] = (event.timestamp, {
+            "severity": event.severity.name,
+            "event_type": event.event_type.name,
+            "source_name": event.source.name,
+            "source_ip": event.source.ip_address,
+            "location_country": event.source.location.country,
+            "location_city": event.source.location.city,
+        })
+        self.event_index.move_to_end(event.id)
+        while len(self.event_index) > self.event_index_size:
+            self.event_index.popitem(last=False)
+
+    def clear_event_index(self):
+        self.event_index.clear()
+
+    @staticmethod
+    def to_flux_time(timestamp: datetime) -> str:
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        return timestamp.astimezone(timezone.utc).isoformat()
+
+    @staticmethod
+    def record_to_event(record) -> Dict:
+        return {
+            "id": record.values.get("event_id"),
+            "timestamp": record.get_time(),
+            "message": record.values.get("message"),
+            "severity": record.values.get("severity"),
+            "event_type": record.values.get("event_type"),
+            "source_name": record.values.get("source_name"),
+            "source_ip": record.values.get("source_ip"),
+            "location_country": record.values.get("location_country"),
+            "location_city": record.values.get("location_city")
+        }
+
     def query_events(
             self,
             start_time: datetime,
@@ -80,6 +145,7 @@ class InfluxDBManager:
             for key, value in filters.items():
                 query += f'|> filter(fn: (r) => r["{key}"] == "{value}")'
 
+        query += '|> pivot(rowKey: ["_time"], columnKey: ["_field"], valueColumn: "_value")'
         query += '|> yield(name: "results")'
 
         try:
@@ -89,16 +155,7 @@ class InfluxDBManager:
             events = []
             for table in result:
                 for record in table.records:
-                    events.append({
-                        "timestamp": record.get_time(),
-                        "message": record.get_value(),
-                        "severity": record.values.get("severity"),
-                        "event_type": record.values.get("event_type"),
-                        "source_name": record.values.get("source_name"),
-                        "source_ip": record.values.get("source_ip"),
-                        "location_country": record.values.get("location_country"),
-                        "location_city": record.values.get("location_city")
-                    })
+                    events.append(self.record_to_event(record))
             return events
         except Exception as e:
             print(f"Error querying InfluxDB: {e}")
@@ -115,6 +172,7 @@ class InfluxDBManager:
                 |> filter(fn: (r) => r["severity"] == "{old_severity}")
                 |> filter(fn: (r) => r["event_type"] == "{event_type}")
                 |> filter(fn: (r) => r["source_name"] == "{source_name}")
+                |> pivot(rowKey: ["_time"], columnKey: ["_field"], valueColumn: "_value")
             '''
 
             query_api = self.client.query_api()
@@ -135,7 +193,9 @@ class InfluxDBManager:
                 .tag("source_ip", record.values.get("source_ip")) \
                 .tag("location_country", record.values.get("location_country")) \
                 .tag("location_city", record.values.get("location_city")) \
-                .field("message", record.get_value())
+                .field("message", record.values.get("message"))
+            if record.values.get("event_id"):
+                point.field("event_id", record.values.get("event_id"))
 
             # Delete the old point
             self.delete_api.delete(
@@ -148,12 +208,109 @@ class InfluxDBManager:
 
             # Write the new point
             self.write_api.write(bucket=self.bucket, org=self.client.org, record=point)
+            if record.values.get("event_id"):
+                self.event_index.pop(record.values.get("event_id"), None)
             return True
 
         except Exception as e:
             print(f"Error updating event severity in InfluxDB: {e}")
             return False
 
+    def query_event_record(self, event_id: str, start_time: datetime, stop_time: datetime, tags: Dict[str, str]):
+        query = f'''
+        from(bucket: "{self.bucket}")
+            |> range(start: {self.to_flux_time(start_time)}, stop: {self.to_flux_time(stop_time)})
+            |> filter(fn: (r) => r["_measurement"] == "events")
+        '''
+        for key, value in tags.items():
+            query += f'|> filter(fn: (r) => r["{key}"] == "{value}")'
+        query += '|> pivot(rowKey: ["_time"], columnKey: ["_field"], valueColumn: "_value")'
+        query += f'|> filter(fn: (r) => r["event_id"] == "{event_id}")'
+
+        query_api = self.client.query_api()
+        result = query_api.query(org=self.client.org, query=query)
+        for table in result:
+            for record in table.records:
+                return record
+        return None
+
+    def find_event_record(self, event_id: str):
+        """
+        Locate a single event by ID, using the index for an exact (timestamp, series)
+        lookup and falling back to the millisecond window encoded in the ID.
+        """
+        event_id = event_id.upper()
+        id_timestamp = Utilities.event_id_timestamp(event_id)
+
+        indexed = self.event_index.get(event_id)
+        if indexed is not None:
+            timestamp, tags = indexed
+            record = self.query_event_record(event_id, timestamp, timestamp + timedelta(microseconds=1), tags)
+            if record is not None:
+                return record
+            # Stale entry: another worker may have changed the series (e.g. its severity)
+            # or deleted the event, so search the ID's window without tag filters.
+            self.event_index.pop(event_id, None)
+
+        return self.query_event_record(event_id, id_timestamp, id_timestamp + timedelta(milliseconds=1), {})
+
+    def get_event(self, event_id: str) -> Optional[Dict]:
+        record = self.find_event_record(event_id)
+        if record is None:
+            return None
+        return self.record_to_event(record)
+
+    def delete_event_record(self, record):
+        timestamp = record.get_time()
+        predicate = '_measurement="events"'
+        for key in SERIES_TAGS:
+            predicate += f' and {key}="{record.values.get(key)}"'
+        self.delete_api.delete(
+            start=timestamp,
+            stop=timestamp + timedelta(microseconds=1),
+            bucket=self.bucket,
+            org=self.client.org,
+            predicate=predicate
+        )
+
+    def update_event_severity_by_id(self, event_id: str, new_severity: str) -> bool:
+        try:
+            record = self.find_event_record(event_id)
+            if record is None:
+                return False
+
+            point = Point("events").time(record.get_time())
+            for key in SERIES_TAGS:
+                point.tag(key, new_severity if key == "severity" else record.values.get(key))
+            point.field("message", record.values.get("message"))
+            point.field("event_id", record.values.get("event_id"))
+
+            self.delete_event_record(record)
+            self.write_api.write(bucket=self.bucket, org=self.client.org, record=point)
+
+            tags = {key: record.values.get(key) for key in SERIES_TAGS}
+            tags["severity"] = new_severity
+            self.event_index[record.values.get("event_id")] = (record.get_time(), tags)
+            return True
+
+        except Exception as e:
+            print(f"Error updating event severity in InfluxDB: {e}")
+            return False
+
+    def delete_event(self, event_id: str) -> bool:
+        try:
+            record = self.find_event_record(event_id)
+            if record is None:
+                return False
+
+            self.delete_event_record(record)
+            self.event_index.pop(record.values.get("event_id"), None)
+            return True
+
+        except Exception as e:
+            print(f"Error deleting event from InfluxDB: {e}")
+            return False
+
     def query_events_by_country(
             self,
             country: str,
@@ -174,6 +331,7 @@ class InfluxDBManager:
           |> range(start: {start_str}, stop: {end_str})
           |> filter(fn: (r) => r._measurement == "events")
           |> filter(fn: (r) => r.location_country == "{country}")
+          |> pivot(rowKey: ["_time"], columnKey: ["_field"], valueColumn: "_value")
         '''
 
         # Add any additional filters
@@ -190,8 +348,9 @@ class InfluxDBManager:
             for table in result:
                 for record in table.records:
                     event = {
+                        "id": record.values.get("event_id"),
                         "timestamp": record.get_time(),
-                        "message": record.get_value(),
+                        "message": record.values.get("message"),
                         "severity": record.values.get("severity"),
                         "event_type": record.values.get("event_type"),
                         "source": {
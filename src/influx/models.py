@@ -1,6 +1,23 @@
+import hashlib
+import os
 import random
-from pydantic import BaseModel
-from datetime import datetime, timedelta
+from typing import Optional
+from pydantic import BaseModel, Field, field_validator, model_validator
+from datetime import datetime, timedelta, timezone
+
+# Crockford base32 alphabet used by ULIDs; sorts lexicographically in time order.
+EVENT_ID_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+EVENT_ID_LENGTH = 26
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+# IDs can only encode what a datetime can represent, from the epoch up to year 9999.
+MAX_EVENT_MILLISECONDS = (datetime.max.replace(tzinfo=timezone.utc) - EPOCH) // timedelta(milliseconds=1)
+
+# Column sizes of the MariaDB events table, enforced here so both backends reject the
+# same events with a 422.
+MAX_MESSAGE_LENGTH = 255
+MAX_NAME_LENGTH = 32
+MAX_SOURCE_LENGTH = 64
+MAX_IP_ADDRESS_LENGTH = 45
 
 SAMPLE_DATA = {
     "severities": [
@@ -69,37 +86,131 @@ SAMPLE_DATA = {
 
 class Location(BaseModel):
     name: str
-    country: str
-    city: str
+    country: str = Field(max_length=MAX_SOURCE_LENGTH)
+    city: str = Field(max_length=MAX_SOURCE_LENGTH)
 
 class Source(BaseModel):
-    name: str
-    ip_address: str
+    name: str = Field(max_length=MAX_SOURCE_LENGTH)
+    ip_address: str = Field(max_length=MAX_IP_ADDRESS_LENGTH)
     location: Location
 
 class EventType(BaseModel):
-    name: str
+    name: str = Field(max_length=MAX_NAME_LENGTH)
     description: str
 
 class Severity(BaseModel):
-    name: str
+    name: str = Field(max_length=MAX_NAME_LENGTH)
     description: str
 
 class Event(BaseModel):
+    id: Optional[str] = None
     timestamp: datetime
-    message: str
+    message: str = Field(max_length=MAX_MESSAGE_LENGTH)
     severity: Severity
     event_type: EventType
     source: Source
 
+    @field_validator("timestamp")
+    @classmethod
+    def check_timestamp(cls, timestamp: datetime) -> datetime:
+        if Utilities.event_milliseconds(timestamp) < 0:
+            raise ValueError("Event timestamps before 1970 are not supported")
+        return timestamp
+
+    @model_validator(mode="after")
+    def normalize_id(self):
+        if self.id is not None:
+            self.id = Utilities.normalize_event_id(self.id, self.timestamp)
+        return self
+
 class UpdateEventSeverity(BaseModel):
     timestamp: datetime
     old_severity: str
-    new_severity: str
+    new_severity: str = Field(max_length=MAX_NAME_LENGTH)
     event_type: str
     source_name: str
 
+class UpdateEventSeverityById(BaseModel):
+    new_severity: str = Field(max_length=MAX_NAME_LENGTH)
+
 class Utilities:
+    @staticmethod
+    def event_milliseconds(timestamp: datetime) -> int:
+        """
+        Exact milliseconds since the epoch; naive timestamps are taken as UTC.
+        """
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        return (timestamp - EPOCH) // timedelta(milliseconds=1)
+
+    @staticmethod
+    def generate_event_id(timestamp: Optional[datetime] = None, entropy: Optional[bytes] = None) -> str:
+        """
+        Generate a ULID-style event ID: 48 bits of milliseconds since the epoch
+        followed by 80 bits taken from entropy (random if not given), encoded as
+        26 Crockford base32 characters.
+        """
+        if timestamp is None:
+            timestamp = datetime.now(timezone.utc)
+        if entropy is None:
+            entropy = os.urandom(10)
+        milliseconds = Utilities.event_milliseconds(timestamp)
+        if milliseconds < 0:
+            raise ValueError("Event timestamps before 1970 are not supported")
+        value = (milliseconds << 80) | int.from_bytes(entropy[:10], "big")
+
+        chars = []
+        for _ in range(EVENT_ID_LENGTH):
+            chars.append(EVENT_ID_ALPHABET[value & 0x1F])
+            value >>= 5
+        return "".join(reversed(chars))
+
+    @staticmethod
+    def event_id_timestamp(event_id: str) -> datetime:
+        """
+        Decode the millisecond timestamp embedded in an event ID.
+        """
+        if len(event_id) != EVENT_ID_LENGTH:
+            raise ValueError(f"Invalid event ID: {event_id}")
+        value = 0
+        for char in event_id.upper():
+            index = EVENT_ID_ALPHABET.find(char)
+            if index < 0:
+                raise ValueError(f"Invalid event ID: {event_id}")
+            value = (value << 5) | index
+        if value >> 128 or value >> 80 > MAX_EVENT_MILLISECONDS:
+            raise ValueError(f"Invalid event ID: {event_id}")
+        return EPOCH + timedelta(milliseconds=value >> 80)
+
+    @staticmethod
+    def normalize_event_id(event_id: str, timestamp: datetime) -> str:
+        """
+        Uppercase a client-supplied event ID and check that it encodes the event's
+        millisecond, which lookups rely on to find the event without an index.
+        """
+        event_id = event_id.upper()
+        id_milliseconds = Utilities.event_milliseconds(Utilities.event_id_timestamp(event_id))
+        if id_milliseconds != Utilities.event_milliseconds(timestamp):
+            raise ValueError(f"Event ID {event_id} does not match the event timestamp")
+        return event_id
+
+    @staticmethod
+    def event_content_digest(event: Event) -> bytes:
+        return hashlib.blake2b(event.model_dump_json(exclude={"id"}).encode(), digest_size=16).digest()
+
+    @staticmethod
+    def ensure_event_id(event: Event) -> str:
+        """
+        Assign an ID unless the client sent one. Generated IDs are derived from the event
+        content, so a retried event gets the same ID on any worker and the database key
+        rejects the duplicate.
+        """
+        if event.id is None:
+            event.id = Utilities.generate_event_id(event.timestamp, Utilities.event_content_digest(event))
+        else:
+            event.id = Utilities.normalize_event_id(event.id, event.timestamp)
+        return event.id
+
     @staticmethod
     def get_random_event_json() -> dict:
         reference_time = datetime.now()
@@ -1,50 +1,105 @@
-import mariadb
+import asyncio
 import random
-import os
-from typing import Optional, List
+from typing import Optional, List, Callable
 from datetime import datetime, timedelta
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException
+from dedup import IngestDeduplicator, IdempotencyKeyMismatch
 from influx.manager import InfluxDBManager
-from influx.models import Event, UpdateEventSeverity, SAMPLE_DATA, Severity, EventType, Source
-
-def get_mariadb_connection():
-    try:
-        connection = mariadb.connect(
-            host=os.environ['MARIADB_HOST'],
-            user=os.environ['MARIADB_USER'],
-            password=os.environ['MARIADB_PASSWORD'],
-            database=os.environ['MARIADB_DATABASE'],
-        )
-    except mariadb.Error as e:
-        print(f"Error: {e}")
-        return False
-
-    return connection
+from influx.models import Event, UpdateEventSeverity, UpdateEventSeverityById, SAMPLE_DATA, Severity, EventType, \
+    Source, Utilities
+from maria.manager import MariaDBManager
 
 app = FastAPI()
 influxdb = InfluxDBManager()
+mariadb = MariaDBManager()
+# Retried ingests are deduplicated per backend, since the same event may be sent to both.
+influxdb_dedup = IngestDeduplicator()
+mariadb_dedup = IngestDeduplicator()
 
-@app.post("/influxdb/event/")
-async def create_event(event: Event):
-    timestamp_start = datetime.now()
-    success = influxdb.write_event(event)
-    timestamp_end = datetime.now()
-    total_milliseconds = int(timestamp_end.timestamp() * 1000) - int(timestamp_start.timestamp() * 1000)
-    if not success:
-        raise HTTPException(status_code=500, detail="Failed to write event to database")
+async def flush_mariadb_periodically():
+    while True:
+        await asyncio.sleep(mariadb.flush_interval)
+        mariadb.flush()
 
-    return {"total_milliseconds": total_milliseconds, "message": "Event logged successfully"}
+@app.on_event("startup")
+async def start_write_batching():
+    if mariadb.write_batch_size > 1:
+        app.state.mariadb_flush_task = asyncio.create_task(flush_mariadb_periodically())
 
-@app.post("/influxdb/events/")
-async def create_event(events: List[Event]):
+@app.on_event("shutdown")
+async def drain_writes():
+    """
+    Flush buffered writes before the worker exits so no accepted event is lost.
+    """
+    flush_task = getattr(app.state, "mariadb_flush_task", None)
+    if flush_task is not None:
+        flush_task.cancel()
+    try:
+        mariadb.close()
+    except Exception as e:
+        print(f"Error draining MariaDB writes: {e}")
+        raise
+    finally:
+        influxdb.close()
+
+def write_deduplicated(
+        write: Callable[[List[Event]], bool],
+        deduplicator: IngestDeduplicator,
+        events: List[Event],
+        idempotency_key: Optional[str],
+        message: str
+) -> dict:
+    """
+    Write only the events not already accepted, replaying the stored response when the
+    Idempotency-Key was seen before with the same payload. Duplicates keep their IDs.
+    """
+    for event in events:
+        Utilities.ensure_event_id(event)
+
+    fingerprint = deduplicator.fingerprint(events)
+    try:
+        replay = deduplicator.replay(idempotency_key, fingerprint)
+    except IdempotencyKeyMismatch as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if replay is not None:
+        return dict(replay, replayed=True)
+
+    pending, duplicates = deduplicator.filter_new(events)
     timestamp_start = datetime.now()
-    success = influxdb.write_events_batch(events)
+    success = write(pending) if pending else True
     timestamp_end = datetime.now()
     total_milliseconds = int(timestamp_end.timestamp() * 1000) - int(timestamp_start.timestamp() * 1000)
     if not success:
         raise HTTPException(status_code=500, detail="Failed to write events to database")
 
-    return {"total_milliseconds": total_milliseconds, "message": "Events logged successfully"}
+    response = {
+        "total_milliseconds": total_milliseconds,
+        "ids": [event.id for event in events],
+        "duplicates_dropped": duplicates,
+        "message": message
+    }
+    deduplicator.accept(pending, idempotency_key, fingerprint, response)
+    return response
+
+def validate_event_id(event_id: str):
+    try:
+        Utilities.event_id_timestamp(event_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.post("/influxdb/event/")
+async def create_event(event: Event, idempotency_key: Optional[str] = Header(None)):
+    response = write_deduplicated(
+        lambda events: influxdb.write_event(events[0]), influxdb_dedup, [event], idempotency_key,
+        "Event logged successfully"
+    )
+    return dict(response, id=response["ids"][0])
+
+@app.post("/influxdb/events/")
+async def create_event(events: List[Event], idempotency_key: Optional[str] = Header(None)):
+    return write_deduplicated(
+        influxdb.write_events_batch, influxdb_dedup, events, idempotency_key, "Events logged successfully"
+    )
 
 @app.get("/influxdb/events/")
 async def get_events(
@@ -81,7 +136,8 @@ async def clear_events_influxdb(
     end_time: Optional[datetime] = None
 ):
     """
-    Clear events from the InfluxDB bucket within the given time range.
+    Clear events from the InfluxDB bucket within the given time range. Only this
+    worker's ingest deduplication cache is reset.
     """
     if start_time is None:
         start_time = datetime.now() - timedelta(days=1080)
@@ -98,6 +154,8 @@ async def clear_events_influxdb(
         )
         timestamp_end = datetime.now()
         total_milliseconds = int(timestamp_end.timestamp() * 1000) - int(timestamp_start.timestamp() * 1000)
+        influxdb.clear_event_index()
+        influxdb_dedup.reset()
 
         return {"total_milliseconds": total_milliseconds, "message": "Events cleared successfully"}
     except Exception as e:
@@ -123,6 +181,161 @@ async def update_event_severity(request: UpdateEventSeverity):
 
     return {"total_milliseconds": total_milliseconds, "message": f"Event severity updated successfully."}
 
+@app.get("/influxdb/events/{event_id}")
+async def get_event_influxdb(event_id: str):
+    validate_event_id(event_id)
+    timestamp_start = datetime.now()
+    try:
+        event = influxdb.get_event(event_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error querying InfluxDB: {e}")
+    timestamp_end = datetime.now()
+    total_milliseconds = int(timestamp_end.timestamp() * 1000) - int(timestamp_start.timestamp() * 1000)
+    if event is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+
+    return {"total_milliseconds": total_milliseconds, "event": event}
+
+@app.put("/influxdb/events/{event_id}")
+async def update_event_influxdb(event_id: str, request: UpdateEventSeverityById):
+    validate_event_id(event_id)
+    timestamp_start = datetime.now()
+    success = influxdb.update_event_severity_by_id(event_id, request.new_severity)
+    timestamp_end = datetime.now()
+    total_milliseconds = int(timestamp_end.timestamp() * 1000) - int(timestamp_start.timestamp() * 1000)
+    if not success:
+        raise HTTPException(status_code=404, detail="Event not found or failed to update severity")
+
+    return {"total_milliseconds": total_milliseconds, "message": "Event severity updated successfully."}
+
+@app.delete("/influxdb/events/{event_id}")
+async def delete_event_influxdb(event_id: str):
+    validate_event_id(event_id)
+    timestamp_start = datetime.now()
+    success = influxdb.delete_event(event_id)
+    timestamp_end = datetime.now()
+    total_milliseconds = int(timestamp_end.timestamp() * 1000) - int(timestamp_start.timestamp() * 1000)
+    if not success:
+        raise HTTPException(status_code=404, detail="Event not found or failed to delete")
+    influxdb_dedup.forget(event_id)
+
+    return {"total_milliseconds": total_milliseconds, "message": "Event deleted successfully."}
+
+@app.post("/mariadb/event/")
+async def create_event_mariadb(event: Event, idempotency_key: Optional[str] = Header(None)):
+    response = write_deduplicated(
+        lambda events: mariadb.write_event(events[0]), mariadb_dedup, [event], idempotency_key,
+        "Event logged successfully"
+    )
+    return dict(response, id=response["ids"][0])
+
+@app.post("/mariadb/events/")
+async def create_events_mariadb(events: List[Event], idempotency_key: Optional[str] = Header(None)):
+    return write_deduplicated(
+        mariadb.write_events_batch, mariadb_dedup, events, idempotency_key, "Events logged successfully"
+    )
+
+@app.get("/mariadb/events/")
+async def get_events_mariadb(
+        start_time: datetime,
+        end_time: datetime,
+        severity: Optional[str] = None,
+        event_type: Optional[str] = None,
+        source_name: Optional[str] = None,
+        country: Optional[str] = None,
+        city: Optional[str] = None
+):
+    filters = {}
+    if severity:
+        filters["severity"] = severity
+    if event_type:
+        filters["event_type"] = event_type
+    if source_name:
+        filters["source_name"] = source_name
+    if country:
+        filters["location_country"] = country
+    if city:
+        filters["location_city"] = city
+
+    timestamp_start = datetime.now()
+    events = mariadb.query_events(start_time, end_time, filters)
+    timestamp_end = datetime.now()
+    total_milliseconds = int(timestamp_end.timestamp() * 1000) - int(timestamp_start.timestamp() * 1000)
+
+    return {"total_milliseconds": total_milliseconds, "events": events}
+
+@app.delete("/mariadb/clear-events/")
+async def clear_events_mariadb(
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None
+):
+    """
+    Clear events from the MariaDB events table within the given time range. Only this
+    worker's ingest deduplication cache is reset.
+    """
+    if start_time is None:
+        start_time = datetime.now() - timedelta(days=1080)
+    if end_time is None:
+        end_time = datetime.now() + timedelta(days=1)
+    timestamp_start = datetime.now()
+    success = mariadb.clear_events(start_time, end_time)
+    mariadb_dedup.reset()
+    timestamp_end = datetime.now()
+    total_milliseconds = int(timestamp_end.timestamp() * 1000) - int(timestamp_start.timestamp() * 1000)
+    if not success:
+        raise HTTPException(status_code=500, detail="Error clearing events")
+
+    return {"total_milliseconds": total_milliseconds, "message": "Events cleared successfully"}
+
+@app.get("/mariadb/events/{event_id}")
+async def get_event_mariadb(event_id: str):
+    validate_event_id(event_id)
+    timestamp_start = datetime.now()
+    event = mariadb.get_event(event_id)
+    timestamp_end = datetime.now()
+    total_milliseconds = int(timestamp_end.timestamp() * 1000) - int(timestamp_start.timestamp() * 1000)
+    if event is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+
+    return {"total_milliseconds": total_milliseconds, "event": event}
+
+@app.put("/mariadb/events/{event_id}")
+async def update_event_mariadb(event_id: str, request: UpdateEventSeverityById):
+    validate_event_id(event_id)
+    timestamp_start = datetime.now()
+    success = mariadb.update_event_severity_by_id(event_id, request.new_severity)
+    timestamp_end = datetime.now()
+    total_milliseconds = int(timestamp_end.timestamp() * 1000) - int(timestamp_start.timestamp() * 1000)
+    if not success:
+        raise HTTPException(status_code=404, detail="Event not found or failed to update severity")
+
+    return {"total_milliseconds": total_milliseconds, "message": "Event severity updated successfully."}
+
+@app.delete("/mariadb/events/{event_id}")
+async def delete_event_mariadb(event_id: str):
+    validate_event_id(event_id)
+    timestamp_start = datetime.now()
+    success = mariadb.delete_event(event_id)
+    timestamp_end = datetime.now()
+    total_milliseconds = int(timestamp_end.timestamp() * 1000) - int(timestamp_start.timestamp() * 1000)
+    if not success:
+        raise HTTPException(status_code=404, detail="Event not found or failed to delete")
+    mariadb_dedup.forget(event_id)
+
+    return {"total_milliseconds": total_milliseconds, "message": "Event deleted successfully."}
+
+
+@app.get("/ingest/stats")
+async def get_ingest_stats():
+    """
+    Duplicate and replay counters of this worker's ingest deduplication, plus the rows
+    MariaDB skipped on its primary key (retries this worker's cache did not catch).
+    With APP_WORKERS > 1 each request sees a single worker, not the totals.
+    """
+    return {
+        "influxdb": influxdb_dedup.stats,
+        "mariadb": dict(mariadb_dedup.stats, duplicate_rows_ignored=mariadb.duplicate_rows_ignored)
+    }
 
 @app.post("/generate-events/")
 async def generate_events(
@@ -0,0 +1,213 @@
+import os
+import time
+import mariadb
+from datetime import datetime, timezone
+from typing import List, Dict, Optional
+
+from src.influx.models import Event, Utilities
+
+EVENT_COLUMNS = ["id", "timestamp", "message", "severity", "event_type", "source_name", "source_ip",
+                 "location_country", "location_city"]
+
+class MariaDBManager:
+    def get_mariadb_connection(self):
+        try:
+            self.connection = mariadb.connect(
+                host=os.environ['MARIADB_HOST'],
+                user=os.environ['MARIADB_USER'],
+                password=os.environ['MARIADB_PASSWORD'],
+                database=os.environ['MARIADB_DATABASE'],
+                autocommit=True,
+            )
+        except mariadb.Error as e:
+            print(f"Error: {e}")
+            return False
+
+        return self.connection
+
+    def __init__(self):
+        # The database container may still be starting, so connect lazily.
+        self.connection = None
+        # MARIADB_WRITE_BATCH_SIZE > 1 buffers single-event writes and inserts them
+        # together; flush() must then be called periodically and on shutdown.
+        self.write_batch_size = int(os.getenv('MARIADB_WRITE_BATCH_SIZE', '1'))
+        self.flush_interval = int(os.getenv('MARIADB_WRITE_FLUSH_INTERVAL', '1000')) / 1000
+        self.flush_retries = int(os.getenv('MARIADB_WRITE_FLUSH_RETRIES', '5'))
+        self.pending_rows = []
+        self.failed_flushes = 0
+        self.duplicate_rows_ignored = 0
+
+    def cursor(self):
+        if not self.connection:
+            self.get_mariadb_connection()
+        else:
+            try:
+                self.connection.ping()
+            except mariadb.Error:
+                self.get_mariadb_connection()
+        if not self.connection:
+            raise mariadb.Error("No connection to MariaDB")
+        return self.connection.cursor(dictionary=True)
+
+    @staticmethod
+    def to_db_time(timestamp: datetime) -> datetime:
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+        return timestamp
+
+    @staticmethod
+    def create_event_row(event: Event) -> tuple:
+        event_id = Utilities.ensure_event_id(event)
+        return (
+            event_id,
+            MariaDBManager.to_db_time(event.timestamp),
+            event.message,
+            event.severity.name,
+            event.event_type.name,
+            event.source.name,
+            event.source.ip_address,
+            event.source.location.country,
+            event.source.location.city,
+        )
+
+    def write_event(self, event: Event) -> bool:
+        if self.write_batch_size <= 1:
+            return self.write_events_batch([event])
+
+        self.pending_rows.append(self.create_event_row(event))
+        if len(self.pending_rows) >= self.write_batch_size and not self.flush():
+            # This request fails, so its row must not be written later. The rows accepted
+            # earlier stay buffered for the next flush.
+            self.pending_rows.pop()
+            return False
+        return True
+
+    def write_events_batch(self, events: List[Event]) -> bool:
+        return self.insert_rows([self.create_event_row(event) for event in events])
+
+    def flush(self) -> bool:
+        """
+        Insert the buffered rows. On failure they stay buffered, as their events were
+        already acknowledged, and the next flush retries them.
+        """
+        if not self.pending_rows:
+            return True
+        if not self.insert_rows(self.pending_rows):
+            self.failed_flushes += 1
+            print(f"Error flushing {len(self.pending_rows)} buffered events to MariaDB "
+                  f"({self.failed_flushes} consecutive failures)")
+            return False
+        self.pending_rows = []
+        self.failed_flushes = 0
+        return True
+
+    def close(self):
+        """
+        Flush buffered writes, trying up to flush_retries times (at least once), and close
+        the connection. Raises if buffered events could not be written.
+        """
+        try:
+            attempts = max(1, self.flush_retries)
+            for attempt in range(attempts):
+                if self.flush():
+                    break
+                if attempt + 1 < attempts:
+                    time.sleep(min(2 ** attempt, 10))
+            else:
+                raise mariadb.Error(f"Lost {len(self.pending_rows)} buffered events: MariaDB flush failed")
+        finally:
+            if self.connection:
+                self.connection.close()
+                self.connection = None
+
+    def insert_rows(self, rows: List[tuple]) -> bool:
+        placeholders = ", ".join("?" for _ in EVENT_COLUMNS)
+        try:
+            cursor = self.cursor()
+            # Event IDs are derived from the content, so a retried event hits the primary
+            # key and is skipped, whichever worker wrote it first.
+            cursor.executemany(
+                f"INSERT INTO events ({', '.join(EVENT_COLUMNS)}) VALUES ({placeholders}) "
+                f"ON DUPLICATE KEY UPDATE id = id",
+                rows
+            )
+            if cursor.rowcount >= 0:
+                self.duplicate_rows_ignored += len(rows) - cursor.rowcount
+            cursor.close()
+            return True
+        except mariadb.Error as e:
+            print(f"Error writing to MariaDB: {e}")
+            return False
+
+    def query_events(
+            self,
+            start_time: datetime,
+            end_time: datetime,
+            filters: Optional[Dict] = None
+    ) -> List[Dict]:
+        query = f"SELECT {', '.join(EVENT_COLUMNS)} FROM events WHERE timestamp >= ? AND timestamp < ?"
+        params = [self.to_db_time(start_time), self.to_db_time(end_time)]
+
+        if filters:
+            for key, value in filters.items():
+                if key not in EVENT_COLUMNS:
+                    continue
+                query += f" AND {key} = ?"
+                params.append(value)
+
+        try:
+            cursor = self.cursor()
+            cursor.execute(query, params)
+            events = cursor.fetchall()
+            cursor.close()
+            return events
+        except mariadb.Error as e:
+            print(f"Error querying MariaDB: {e}")
+            return []
+
+    def get_event(self, event_id: str) -> Optional[Dict]:
+        try:
+            cursor = self.cursor()
+            cursor.execute(f"SELECT {', '.join(EVENT_COLUMNS)} FROM events WHERE id = ?", (event_id.upper(),))
+            event = cursor.fetchone()
+            cursor.close()
+            return event
+        except mariadb.Error as e:
+            print(f"Error querying MariaDB: {e}")
+            return None
+
+    def update_event_severity_by_id(self, event_id: str, new_severity: str) -> bool:
+        try:
+            cursor = self.cursor()
+            cursor.execute("UPDATE events SET severity = ? WHERE id = ?", (new_severity, event_id.upper()))
+            # affected_rows is 0 both for a missing ID and an unchanged severity.
+            found = cursor.rowcount > 0 or self.get_event(event_id) is not None
+            cursor.close()
+            return found
+        except mariadb.Error as e:
+            print(f"Error updating event severity in MariaDB: {e}")
+            return False
+
+    def delete_event(self, event_id: str) -> bool:
+        try:
+            cursor = self.cursor()
+            cursor.execute("DELETE FROM events WHERE id = ?", (event_id.upper(),))
+            deleted = cursor.rowcount > 0
+            cursor.close()
+            return deleted
+        except mariadb.Error as e:
+            print(f"Error deleting event from MariaDB: {e}")
+            return False
+
+    def clear_events(self, start_time: datetime, end_time: datetime) -> bool:
+        try:
+            cursor = self.cursor()
+            cursor.execute(
+                "DELETE FROM events WHERE timestamp >= ? AND timestamp <= ?",
+                (self.to_db_time(start_time), self.to_db_time(end_time))
+            )
+            cursor.close()
+            return True
+        except mariadb.Error as e:
+            print(f"Error clearing events from MariaDB: {e}")
+            return False
@@ -1,177 +1,182 @@
+import argparse
 import json
+import random
+import sys
 import time
 import requests
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Optional
 from influx.models import Utilities
-
-host = "http://localhost:8000"
-runs = 3
-# spans = [1, 10, 50, 100, 500, 1000, 5000, 10000, 50000, 100000, 500000, 1000000]
-spans = [1, 10]
-
-def measure_create_delete():
-    global spans, runs
-
-    data_create = []
-    data_delete = []
-    for span in spans:
-        create_runs_time = 0
-        delete_runs_time = 0
-        events_json_influx = []
-        for _ in range(span):
-            events_json_influx.append(Utilities.get_random_event_json())
-        for __ in range(runs):
-            response = requests.post(
-                url=f"{host}/influxdb/events",
-                json=events_json_influx,
-                headers={"Content-Type": "application/json"}
-            )
-            if response.status_code != 200:
-                print(f"Failed with status code {response.status_code}: {response.text}")
-            response_data = response.json()
-            run_time_milliseconds = response_data.get("total_milliseconds")
-            create_runs_time += run_time_milliseconds
-
-            # Clear generated events
-            url = f"{host}/influxdb/clear-events"
-            response = requests.delete(url)
-            if response.status_code != 200:
-                print(f"Failed with status code {response.status_code}: {response.text}")
-            response_data = response.json()
-            delete_runs_time += response_data.get("total_milliseconds")
-
-        create_average_span_time = create_runs_time / runs
-        data_create.append({"span": span, "duration": create_average_span_time})
-
-        delete_average_span_time = delete_runs_time / runs
-        data_delete.append({"span": span, "duration": delete_average_span_time})
-
-
-    with open("span_duration_data_create.json", "w") as file:
-        file.write(json.dumps(data_create))
-    with open("span_duration_data_delete.json", "w") as file:
-        file.write(json.dumps(data_delete))
-
-def measure_update_get():
-    global spans, runs
-    data_update = []
-    data_get_all = []
-    data_get_severity = []
-    data_get_country = []
-    for span in spans:
-        # Create span-1 events.
-        url = f"{host}/generate-events?events_to_generate={span - 1}"
-        response = requests.post(url=url)
-        if response.status_code != 200:
-            print(f"Failed with status code {response.status_code}: {response.text}")
-
-        runs_time_update = 0
-        runs_time_get_all = 0
-        runs_time_get_severity = 0
-        runs_time_get_country = 0
-        for _ in range(runs):
-            # Add one event with custom data.
-            url = f"{host}/influxdb/event"
-            event_data = {
-                "timestamp": "2025-01-15T10:00:00Z",
-                "message": "System startup completed",
-                "severity": {
-                    "name": "INFO",
-                    "description": "Informational message"
-                },
-                "event_type": {
-                    "name": "SYSTEM_STATUS",
-                    "description": "System status update"
-                },
-                "source": {
-                    "name": "web-server-01",
-                    "ip_address": "192.168.1.100",
-                    "location": {
-                        "name": "DC-North",
-                        "country": "USA",
-                        "city": "Chicago"
-                    }
-                }
-            }
-            response = requests.post(url=url,json=event_data)
-            if response.status_code != 200:
-                print(f"Failed with status code {response.status_code}: {response.text}")
-            time.sleep(0.5)
-
-            # Find all events
-            url = f"{host}/influxdb/events?end_time=2025-01-18T10:00:00Z&start_time=2023-01-01T10:00:00Z"
-            response = requests.get(url=url)
-            if response.status_code != 200:
-                print(f"Failed with status code {response.status_code}: {response.text}")
-            response_data = response.json()
-            runs_time_get_all += response_data.get("total_milliseconds")
-
-            # Find all events with a given severity
-            url = f"{host}/influxdb/events?end_time=2025-01-18T10:00:00Z&start_time=2023-01-01T10:00:00Z&severity=INFO"
-            response = requests.get(url=url)
-            if response.status_code != 200:
-                print(f"Failed with status code {response.status_code}: {response.text}")
-            response_data = response.json()
-            runs_time_get_severity += response_data.get("total_milliseconds")
-
-            # Find all events from a given country
-            url = f"{host}/events/USA"
-            response = requests.get(url=url)
-            if response.status_code != 200:
-                print(f"Failed with status code {response.status_code}: {response.text}")
-            response_data = response.json()
-            runs_time_get_country += response_data.get("total_milliseconds")
-
-            # Update one event
-            url = f"{host}/influxdb/event/severity"
-            event_update_data = {
-                "timestamp": "2025-01-15T10:00:00Z",
-                "old_severity": "INFO",
-                "new_severity": "ERROR",
-                "event_type": "SYSTEM_STATUS",
-                "source_name": "web-server-01"
-            }
-            response = requests.put(
-                url=url,
-                json=event_update_data
-            )
-            if response.status_code != 200:
-                print(f"Failed with status code {response.status_code}: {response.text}")
-            response_data = response.json()
-            run_time_milliseconds = response_data.get("total_milliseconds")
-            runs_time_update += run_time_milliseconds
-
-            # Remove custom event
-            url = f"{host}/influxdb/clear-events?start_time=2025-01-15T10:00:00Z&end_time=2025-01-15T10:00:00Z"
-            response = requests.delete(url)
-            if response.status_code != 200:
-                print(f"Failed with status code {response.status_code}: {response.text}")
-
-        average_span_time_update = runs_time_update / runs
-        data_update.append({"span": span, "duration": average_span_time_update})
-
-        average_span_time_get_all = runs_time_get_all / runs
-        data_get_all.append({"span": span, "duration": average_span_time_get_all})
-
-        average_span_time_get_severity = runs_time_get_severity / runs
-        data_get_severity.append({"span": span, "duration": average_span_time_get_severity})
-
-        average_span_time_get_country = runs_time_get_country / runs
-        data_get_country.append({"span": span, "duration": average_span_time_get_country})
-
-        # Clear generated events
-        url = f"{host}/influxdb/clear-events"
-        response = requests.delete(url)
-        if response.status_code != 200:
-            print(f"Failed with status code {response.status_code}: {response.text}")
-
-    with open("span_duration_data_update.json", "w") as file:
-        file.write(json.dumps(data_update))
-    with open("span_duration_data_get_all.json", "w") as file:
-        file.write(json.dumps(data_get_all))
-    with open("span_duration_data_get_severity.json", "w") as file:
-        file.write(json.dumps(data_get_severity))
-    with open("span_duration_data_get_country.json", "w") as file:
-        file.write(json.dumps(data_get_country))
-
-measure_create_delete()
-# measure_update_get()
+from results import build_metadata, save_results, load_results, summarize, compare_to_baseline
+
+WRITE_OPERATIONS = {"create", "clear"}
+READ_OPERATIONS = {"query", "get", "update"}
+
+MARKER_EVENT = {
+    "message": "System startup completed",
+    "severity": {
+        "name": "INFO",
+        "description": "Informational message"
+    },
+    "event_type": {
+        "name": "SYSTEM_STATUS",
+        "description": "System status update"
+    },
+    "source": {
+        "name": "web-server-01",
+        "ip_address": "192.168.1.100",
+        "location": {
+            "name": "DC-North",
+            "country": "USA",
+            "city": "Chicago"
+        }
+    }
+}
+
+def load_scenario(path: str) -> Dict:
+    with open(path) as file:
+        scenario = json.load(file)
+
+    for operation in scenario["operations"]:
+        if operation["type"] not in WRITE_OPERATIONS | READ_OPERATIONS:
+            raise ValueError(f"Unknown operation type: {operation['type']}")
+    return scenario
+
+def send(method: str, url: str, **kwargs) -> Optional[Dict]:
+    response = requests.request(method, url, **kwargs)
+    if response.status_code != 200:
+        print(f"Failed with status code {response.status_code}: {response.text}")
+        return None
+    return response.json()
+
+def generate_events_json(span: int) -> List[Dict]:
+    return [Utilities.get_random_event_json() for _ in range(span)]
+
+def clear_events(base: str) -> Optional[Dict]:
+    return send("DELETE", f"{base}/clear-events")
+
+def seed_events(base: str, span: int, batch_size: int):
+    remaining = span
+    while remaining > 0:
+        batch = min(batch_size, remaining)
+        send("POST", f"{base}/events", json=generate_events_json(batch))
+        remaining -= batch
+
+def measure_write_operations(scenario: Dict, backend: str, span: int, operations: List[Dict]) -> Dict[str, List[float]]:
+    base = f"{scenario['host']}/{backend}"
+    samples = {operation["name"]: [] for operation in operations}
+    create_names = [operation["name"] for operation in operations if operation["type"] == "create"]
+    clear_names = [operation["name"] for operation in operations if operation["type"] == "clear"]
+
+    for _ in range(scenario["runs"]):
+        # Fresh events every run; resending the same batch would be dropped by ingest deduplication.
+        events_json = generate_events_json(span)
+        response_data = send("POST", f"{base}/events", json=events_json)
+        for name in create_names:
+            if response_data is not None:
+                samples[name].append(response_data["total_milliseconds"])
+
+        # Clearing is always needed between runs; it is only recorded when requested.
+        response_data = clear_events(base)
+        for name in clear_names:
+            if response_data is not None:
+                samples[name].append(response_data["total_milliseconds"])
+
+    return samples
+
+def measure_read_operations(scenario: Dict, backend: str, span: int, operations: List[Dict]) -> Dict[str, List[float]]:
+    base = f"{scenario['host']}/{backend}"
+    samples = {operation["name"]: [] for operation in operations}
+
+    # Create span-1 events; each run adds one marker event on top.
+    seed_events(base, span - 1, scenario.get("seed_batch_size", 50000))
+
+    now = datetime.now(timezone.utc)
+    window = timedelta(hours=scenario.get("query_window_hours", 24))
+    time_range = {"start_time": (now - window).isoformat(), "end_time": (now + window).isoformat()}
+
+    for _ in range(scenario["runs"]):
+        marker = dict(MARKER_EVENT, timestamp=datetime.now(timezone.utc).isoformat())
+        response_data = send("POST", f"{base}/event", json=marker)
+        if response_data is None:
+            continue
+        event_id = response_data["id"]
+        time.sleep(0.5)
+
+        for operation in operations:
+            if operation["type"] == "query":
+                params = dict(time_range, **operation.get("filters", {}))
+                response_data = send("GET", f"{base}/events", params=params)
+            elif operation["type"] == "get":
+                response_data = send("GET", f"{base}/events/{event_id}")
+            else:
+                response_data = send("PUT", f"{base}/events/{event_id}",
+                                     json={"new_severity": operation["new_severity"]})
+            if response_data is not None:
+                samples[operation["name"]].append(response_data["total_milliseconds"])
+
+        # Remove the marker event
+        send("DELETE", f"{base}/events/{event_id}")
+
+    clear_events(base)
+    return samples
+
+def run_scenario(scenario: Dict) -> List[Dict]:
+    write_operations = [operation for operation in scenario["operations"] if operation["type"] in WRITE_OPERATIONS]
+    read_operations = [operation for operation in scenario["operations"] if operation["type"] in READ_OPERATIONS]
+
+    results = []
+    for backend in scenario["backends"]:
+        for span in scenario["dataset_sizes"]:
+            # Reseed per (backend, span) so every backend sees the same dataset.
+            random.seed(f"{scenario['seed']}-{span}")
+            print(f"Measuring {backend} with {span} events")
+
+            samples = {}
+            if write_operations:
+                samples.update(measure_write_operations(scenario, backend, span, write_operations))
+            if read_operations:
+                samples.update(measure_read_operations(scenario, backend, span, read_operations))
+
+            for operation in scenario["operations"]:
+                if samples[operation["name"]]:
+                    results.append(summarize(backend, operation["name"], span, samples[operation["name"]]))
+    return results
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run a benchmark scenario against the event logging API.")
+    parser.add_argument("--scenario", default="scenarios/default.json", help="Scenario JSON file")
+    parser.add_argument("--results-dir", default="results", help="Directory of the results store")
+    parser.add_argument("--baseline", help="Baseline result set, e.g. sample-results/ or a previous run")
+    parser.add_argument("--threshold", type=float, help="Relative slowdown flagged as a regression")
+    parser.add_argument("--host", help="Override the scenario host")
+    args = parser.parse_args()
+
+    scenario = load_scenario(args.scenario)
+    if args.host:
+        scenario["host"] = args.host
+    threshold = args.threshold if args.threshold is not None else scenario.get("regression_threshold", 0.2)
+
+    metadata = build_metadata(scenario)
+    results = run_scenario(scenario)
+
+    comparison = []
+    if args.baseline:
+        baseline = load_results(args.baseline)
+        comparison = compare_to_baseline(results, baseline["results"], threshold,
+                                         scenario.get("regression_min_delta_ms", 0))
+        metadata["baseline"] = args.baseline
+        if not comparison:
+            print(f"No operations in common with baseline {args.baseline}")
+
+    run_dir = save_results(args.results_dir, metadata, results, comparison)
+    print(f"Results written to {run_dir}")
+
+    regressions = [row for row in comparison if row["regression"]]
+    for row in regressions:
+        print(f"REGRESSION {row['backend']} {row['operation']} span={row['span']}: "
+              f"{row['duration']:.1f}ms vs baseline {row['baseline_duration']:.1f}ms ({row['ratio']:.2f}x)")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
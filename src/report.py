@@ -0,0 +1,182 @@
+import argparse
+import base64
+import html
+import io
+import os
+from collections import defaultdict
+from typing import List, Dict
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+
+from results import load_results
+
+# Durations are reported in whole milliseconds, so 0 means "under 1ms". Derived
+# metrics use this floor to stay finite on log axes.
+MIN_DURATION_MS = 0.5
+PERCENTILES = [10, 50, 90]
+BACKEND_COLORS = {"influxdb": "tab:blue", "mariadb": "tab:orange"}
+# Operations that process every event of the span. Queries, point reads and updates
+# touch a number of events unrelated to the span, so they get no derived metrics.
+SPAN_SCALED_OPERATIONS = {"create", "delete"}
+
+
+def collect_samples(result_sets: List[Dict]) -> Dict:
+    """
+    Pool raw samples from every result set into {operation: {backend: {span: [ms, ...]}}}.
+    """
+    samples = defaultdict(lambda: defaultdict(lambda: defaultdict(list)))
+    for result_set in result_sets:
+        for row in result_set["results"]:
+            # Rows without a span (e.g. scaling runs from scale.py) are not duration sweeps.
+            if "span" not in row:
+                continue
+            samples[row["operation"]][row["backend"]][row["span"]].extend(row.get("samples") or [row["duration"]])
+    return samples
+
+
+def summarize_samples(span: int, values: List[float], span_scaled: bool) -> Dict:
+    values = np.asarray(values, dtype=float)
+    p10, p50, p90 = np.percentile(values, PERCENTILES)
+    mean = values.mean()
+    # 95% confidence interval of the mean (normal approximation).
+    ci = 1.96 * values.std(ddof=1) / np.sqrt(len(values)) if len(values) > 1 else 0.0
+    median = max(p50, MIN_DURATION_MS)
+    return {
+        "span": span,
+        "count": len(values),
+        "p10": p10,
+        "median": p50,
+        "p90": p90,
+        "mean": mean,
+        "ci": ci,
+        "throughput": span / (median / 1000) if span_scaled else None,
+        "cost": median / span if span_scaled else None,
+    }
+
+
+def build_summary(samples: Dict) -> Dict:
+    summary = {}
+    for operation, backends in samples.items():
+        summary[operation] = {}
+        for backend, spans in backends.items():
+            summary[operation][backend] = [
+                summarize_samples(span, spans[span], operation in SPAN_SCALED_OPERATIONS) for span in sorted(spans)
+            ]
+    return summary
+
+
+def plot_operation(operation: str, backends: Dict) -> bytes:
+    span_scaled = operation in SPAN_SCALED_OPERATIONS
+    if span_scaled:
+        fig, (ax_duration, ax_throughput, ax_cost) = plt.subplots(1, 3, figsize=(18, 5))
+    else:
+        fig, ax_duration = plt.subplots(1, 1, figsize=(6, 5))
+
+    for backend, rows in sorted(backends.items()):
+        color = BACKEND_COLORS.get(backend)
+        spans = np.array([row["span"] for row in rows])
+        median = np.maximum([row["median"] for row in rows], MIN_DURATION_MS)
+        p10 = np.maximum([row["p10"] for row in rows], MIN_DURATION_MS)
+        p90 = np.maximum([row["p90"] for row in rows], MIN_DURATION_MS)
+        mean = np.maximum([row["mean"] for row in rows], MIN_DURATION_MS)
+        ci = np.array([row["ci"] for row in rows])
+
+        ax_duration.plot(spans, median, marker="o", color=color, label=f"{backend} median")
+        ax_duration.fill_between(spans, p10, p90, color=color, alpha=0.2, label=f"{backend} p10-p90")
+        ax_duration.errorbar(spans, mean, yerr=[np.minimum(ci, mean - MIN_DURATION_MS / 2), ci],
+                             fmt="none", ecolor=color, capsize=3, alpha=0.8)
+
+        if span_scaled:
+            ax_throughput.plot(spans, [row["throughput"] for row in rows], marker="o", color=color, label=backend)
+            ax_cost.plot(spans, [row["cost"] for row in rows], marker="o", color=color, label=backend)
+
+    axes = [(ax_duration, "Duration (ms)", "Duration (median, p10-p90, mean 95% CI)")]
+    if span_scaled:
+        axes += [
+            (ax_throughput, "Throughput (events/sec)", "Throughput"),
+            (ax_cost, "Cost per event (ms)", "Per-event cost"),
+        ]
+    for ax, ylabel, title in axes:
+        ax.set_xscale("log")
+        ax.set_yscale("log", nonpositive="clip")
+        ax.set_xlabel("Span (events)")
+        ax.set_ylabel(ylabel)
+        ax.set_title(title)
+        ax.grid(True, which="both", alpha=0.3)
+        ax.legend()
+
+    fig.suptitle(operation)
+    fig.tight_layout()
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=100)
+    plt.close(fig)
+    return buffer.getvalue()
+
+
+def render_table(operation: str, backends: Dict) -> str:
+    rows = []
+    for backend, summaries in sorted(backends.items()):
+        for row in summaries:
+            throughput = f"{row['throughput']:,.0f}" if row["throughput"] is not None else "&ndash;"
+            cost = f"{row['cost']:.4f}" if row["cost"] is not None else "&ndash;"
+            rows.append(
+                f"<tr><td>{html.escape(backend)}</td><td>{row['span']}</td><td>{row['count']}</td>"
+                f"<td>{row['median']:.1f}</td><td>{row['p10']:.1f}</td><td>{row['p90']:.1f}</td>"
+                f"<td>{row['mean']:.1f} &plusmn; {row['ci']:.1f}</td>"
+                f"<td>{throughput}</td><td>{cost}</td></tr>"
+            )
+    return (
+        f"<table><tr><th>Backend</th><th>Span</th><th>Samples</th><th>Median ms</th><th>p10 ms</th>"
+        f"<th>p90 ms</th><th>Mean ms (95% CI)</th><th>Events/sec</th><th>ms/event</th></tr>"
+        f"{''.join(rows)}</table>"
+    )
+
+
+def write_report(result_paths: List[str], output_dir: str) -> str:
+    result_sets = [load_results(path) for path in result_paths]
+    summary = build_summary(collect_samples(result_sets))
+    os.makedirs(output_dir, exist_ok=True)
+
+    sections = []
+    for operation in sorted(summary):
+        image = plot_operation(operation, summary[operation])
+        with open(os.path.join(output_dir, f"{operation}.png"), "wb") as file:
+            file.write(image)
+        sections.append(
+            f"<h2>{html.escape(operation)}</h2>"
+            f"<img src=\"data:image/png;base64,{base64.b64encode(image).decode()}\" alt=\"{html.escape(operation)}\">"
+            f"{render_table(operation, summary[operation])}"
+        )
+
+    sources = "".join(
+        f"<li>{html.escape(path)}: {html.escape(str(result_set['metadata'].get('scenario')))} "
+        f"({html.escape(str(result_set['metadata'].get('git_sha', 'unknown'))[:7])})</li>"
+        for path, result_set in zip(result_paths, result_sets)
+    )
+    report_path = os.path.join(output_dir, "report.html")
+    with open(report_path, "w") as file:
+        file.write(
+            "<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>MariaDB vs. InfluxDB</title>"
+            "<style>body{font-family:sans-serif}img{max-width:100%}"
+            "table{border-collapse:collapse;margin-bottom:2em}"
+            "td,th{border:1px solid #ccc;padding:2px 8px;text-align:right}</style></head><body>"
+            f"<h1>MariaDB vs. InfluxDB</h1><ul>{sources}</ul>{''.join(sections)}</body></html>"
+        )
+    return report_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a comparative report from benchmark result sets.")
+    parser.add_argument("results", nargs="+", help="Result sets: run directories, results.json files or sample-results/")
+    parser.add_argument("--output", default="report", help="Output directory for report.html and PNGs")
+    args = parser.parse_args()
+
+    print(f"Report written to {write_report(args.results, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+import json
+import os
+import platform
+import subprocess
+from datetime import datetime, timezone
+from statistics import mean
+from typing import List, Dict, Optional
+
+RESULTS_FILE = "results.json"
+LEGACY_PREFIX = "span_duration_data_"
+# Legacy sample results were only ever measured against InfluxDB.
+LEGACY_BACKEND = "influxdb"
+
+
+def get_git_sha() -> str:
+    # Inside the container there is no .git, so the SHA can be passed in.
+    if os.getenv("GIT_SHA"):
+        return os.environ["GIT_SHA"]
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL,
+            text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def get_hardware_info() -> Dict:
+    info = {
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+    }
+    try:
+        info["memory_bytes"] = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (AttributeError, ValueError, OSError):
+        info["memory_bytes"] = None
+    return info
+
+
+def build_metadata(scenario: Dict) -> Dict:
+    return {
+        "scenario": scenario.get("name"),
+        "git_sha": get_git_sha(),
+        "seed": scenario.get("seed"),
+        "hardware": get_hardware_info(),
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "scenario_config": scenario,
+    }
+
+
+def save_results(results_dir: str, metadata: Dict, results: List[Dict], comparison: Optional[List[Dict]] = None) -> str:
+    """
+    Write one run into its own directory of the results store and return its path.
+    """
+    started_at = datetime.fromisoformat(metadata["started_at"]).strftime("%Y%m%dT%H%M%S")
+    run_dir = os.path.join(results_dir, f"{started_at}-{metadata['git_sha'][:7]}")
+    os.makedirs(run_dir, exist_ok=True)
+
+    with open(os.path.join(run_dir, RESULTS_FILE), "w") as file:
+        file.write(json.dumps({"metadata": metadata, "results": results, "comparison": comparison or []}, indent=2))
+    return run_dir
+
+
+def load_results(path: str) -> Dict:
+    """
+    Load a result set from a run directory, a results.json file, or a directory of
+    legacy span_duration_data_<operation>.json files such as sample-results/.
+    """
+    if os.path.isfile(path):
+        with open(path, encoding="utf-8-sig") as file:
+            return json.load(file)
+
+    results_path = os.path.join(path, RESULTS_FILE)
+    if os.path.isfile(results_path):
+        return load_results(results_path)
+
+    results = []
+    for file_name in sorted(os.listdir(path)):
+        if not (file_name.startswith(LEGACY_PREFIX) and file_name.endswith(".json")):
+            continue
+        operation = file_name[len(LEGACY_PREFIX):-len(".json")]
+        with open(os.path.join(path, file_name), encoding="utf-8-sig") as file:
+            for row in json.load(file):
+                results.append({
+                    "backend": LEGACY_BACKEND,
+                    "operation": operation,
+                    "span": row["span"],
+                    "duration": row["duration"],
+                    "samples": [row["duration"]],
+                })
+    if not results:
+        raise FileNotFoundError(f"No results found in {path}")
+    return {"metadata": {"scenario": os.path.basename(os.path.normpath(path))}, "results": results}
+
+
+def summarize(backend: str, operation: str, span: int, samples: List[float]) -> Dict:
+    return {
+        "backend": backend,
+        "operation": operation,
+        "span": span,
+        "duration": mean(samples),
+        "samples": samples,
+    }
+
+
+def compare_to_baseline(results: List[Dict], baseline: List[Dict], threshold: float,
+                        min_delta_ms: float = 0.0) -> List[Dict]:
+    """
+    Compare mean durations against a baseline for every (backend, operation, span)
+    present in both. A regression is slower by more than threshold (relative) and
+    min_delta_ms (absolute), so millisecond-level noise on tiny spans is ignored.
+    """
+    baseline_by_key = {(row["backend"], row["operation"], row["span"]): row for row in baseline}
+
+    comparison = []
+    for row in results:
+        key = (row["backend"], row["operation"], row["span"])
+        if key not in baseline_by_key:
+            continue
+        baseline_duration = baseline_by_key[key]["duration"]
+        delta = row["duration"] - baseline_duration
+        ratio = row["duration"] / baseline_duration if baseline_duration else float("inf")
+        comparison.append({
+            "backend": row["backend"],
+            "operation": row["operation"],
+            "span": row["span"],
+            "duration": row["duration"],
+            "baseline_duration": baseline_duration,
+            "ratio": ratio,
+            "regression": ratio > 1 + threshold and delta > min_delta_ms,
+        })
+    return comparison
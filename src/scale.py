@@ -0,0 +1,185 @@
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+import requests
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Optional, Set
+from influx.models import Utilities
+from results import build_metadata, save_results
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_cpus(value: str) -> Set[int]:
+    """
+    Parse a CPU list such as "0-3,6".
+    """
+    cpus = set()
+    for part in value.split(","):
+        start, _, end = part.partition("-")
+        cpus.update(range(int(start), int(end or start) + 1))
+    return cpus
+
+
+def pin_to_cpus(cpus: Optional[Set[int]]):
+    if cpus:
+        os.sched_setaffinity(0, cpus)
+
+
+def default_worker_counts(cpu_count: int) -> List[int]:
+    counts = []
+    workers = 1
+    while workers < cpu_count:
+        counts.append(workers)
+        workers *= 2
+    counts.append(cpu_count)
+    return counts
+
+
+def start_server(workers: int, port: int, cpus: Optional[Set[int]]) -> subprocess.Popen:
+    env = dict(os.environ, APP_WORKERS=str(workers), APP_PORT=str(port), APP_RELOAD="0")
+    env["PYTHONPATH"] = os.path.join(ROOT_DIR, "src")
+    # Worker processes inherit the affinity of the uvicorn supervisor.
+    return subprocess.Popen([sys.executable, "-m", "src.serve"], cwd=ROOT_DIR, env=env,
+                            preexec_fn=lambda: pin_to_cpus(cpus))
+
+
+def wait_until_ready(host: str, timeout: float = 60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(f"{host}/openapi.json", timeout=1).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    raise TimeoutError(f"Server at {host} did not become ready")
+
+
+def stop_server(server: subprocess.Popen):
+    # SIGINT lets uvicorn drain in-flight requests and run the shutdown hooks.
+    server.send_signal(signal.SIGINT)
+    try:
+        server.wait(timeout=60)
+    except subprocess.TimeoutExpired:
+        server.kill()
+        server.wait()
+
+
+def seed_events(host: str, backend: str, count: int, batch_size: int = 10000):
+    while count > 0:
+        batch = min(batch_size, count)
+        requests.post(f"{host}/{backend}/events/",
+                      json=[Utilities.get_random_event_json() for _ in range(batch)])
+        count -= batch
+
+
+def run_client(url: str, operation: str, batch_size: int, duration: float) -> Dict:
+    """
+    Send requests back to back for duration seconds from a single client process.
+    """
+    session = requests.Session()
+    events_json = [Utilities.get_random_event_json() for _ in range(batch_size)]
+    now = datetime.now(timezone.utc)
+    params = {"start_time": (now - timedelta(days=1)).isoformat(), "end_time": (now + timedelta(days=1)).isoformat()}
+
+    completed = 0
+    failed = 0
+    events = 0
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        if operation == "ingest":
+            # Fresh timestamps keep ingest deduplication from dropping repeated batches.
+            timestamp = datetime.now()
+            for i, event in enumerate(events_json):
+                event["timestamp"] = (timestamp + timedelta(microseconds=i)).isoformat()
+            response = session.post(url, json=events_json)
+        else:
+            response = session.get(url, params=params)
+        if response.status_code != 200:
+            failed += 1
+            continue
+        completed += 1
+        events += batch_size if operation == "ingest" else len(response.json()["events"])
+    return {"requests": completed, "failed": failed, "events": events}
+
+
+def measure_throughput(host: str, backend: str, operation: str, clients: int, batch_size: int,
+                       duration: float, client_cpus: Optional[Set[int]]) -> Dict:
+    url = f"{host}/{backend}/events/"
+    with ProcessPoolExecutor(max_workers=clients, initializer=pin_to_cpus, initargs=(client_cpus,)) as pool:
+        futures = [pool.submit(run_client, url, operation, batch_size, duration) for _ in range(clients)]
+        totals = [future.result() for future in futures]
+
+    return {
+        "requests_per_second": sum(total["requests"] for total in totals) / duration,
+        "events_per_second": sum(total["events"] for total in totals) / duration,
+        "failed": sum(total["failed"] for total in totals),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure API throughput as the number of worker processes grows.")
+    parser.add_argument("--server-cpus", type=parse_cpus,
+                        help="CPUs the server is pinned to, e.g. 0-7 (default: all)")
+    parser.add_argument("--client-cpus", type=parse_cpus,
+                        help="CPUs the load generating clients are pinned to; keep them apart from --server-cpus")
+    parser.add_argument("--workers", type=int, nargs="+",
+                        help="Worker counts to measure (default: powers of two up to the server CPU count)")
+    parser.add_argument("--backends", nargs="+", default=["influxdb", "mariadb"])
+    parser.add_argument("--clients", type=int,
+                        help="Concurrent client processes, kept fixed across worker counts "
+                             "(default: twice the client CPU count)")
+    parser.add_argument("--batch-size", type=int, default=100, help="Events per ingest request")
+    parser.add_argument("--query-dataset-size", type=int, default=10000, help="Events present during queries")
+    parser.add_argument("--duration", type=float, default=20, help="Seconds per measurement")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--results-dir", default=os.path.join(ROOT_DIR, "results"),
+                        help="Results store; mounted from the host in docker-compose")
+    args = parser.parse_args()
+
+    server_cpu_count = len(args.server_cpus) if args.server_cpus else os.cpu_count() or 1
+    client_cpu_count = len(args.client_cpus) if args.client_cpus else os.cpu_count() or 1
+    workers_list = args.workers or default_worker_counts(server_cpu_count)
+    clients = args.clients or 2 * client_cpu_count
+    if not args.server_cpus or not args.client_cpus or args.server_cpus & args.client_cpus:
+        print("Warning: clients share CPUs with the server, which lowers the measured scaling; "
+              "use --server-cpus and --client-cpus to separate them")
+
+    host = f"http://localhost:{args.port}"
+    metadata = build_metadata({"name": "scale", "workers": workers_list, "backends": args.backends,
+                               "clients": clients, "batch_size": args.batch_size,
+                               "query_dataset_size": args.query_dataset_size, "duration": args.duration,
+                               "server_cpus": sorted(args.server_cpus or []),
+                               "client_cpus": sorted(args.client_cpus or [])})
+
+    results = []
+    for workers in workers_list:
+        server = start_server(workers, args.port, args.server_cpus)
+        try:
+            wait_until_ready(host)
+            for backend in args.backends:
+                for operation in ["ingest", "query"]:
+                    # Queries always read the same fixed dataset, whatever the ingest phase wrote.
+                    requests.delete(f"{host}/{backend}/clear-events/")
+                    if operation == "query":
+                        seed_events(host, backend, args.query_dataset_size)
+
+                    throughput = measure_throughput(host, backend, operation, clients, args.batch_size,
+                                                    args.duration, args.client_cpus)
+                    print(f"{backend} {operation} workers={workers}: "
+                          f"{throughput['requests_per_second']:.1f} req/s, {throughput['events_per_second']:.1f} events/s")
+                    results.append(dict(throughput, backend=backend, operation=f"scale_{operation}", workers=workers))
+                requests.delete(f"{host}/{backend}/clear-events/")
+        finally:
+            stop_server(server)
+
+    print(f"Results written to {save_results(args.results_dir, metadata, results)}")
+
+
+if __name__ == "__main__":
+    main()
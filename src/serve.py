@@ -0,0 +1,26 @@
+import os
+import uvicorn
+
+
+def main():
+    """
+    Serve the API. APP_WORKERS sets the number of worker processes (default: one per
+    CPU core); each worker imports src.main and so opens its own database clients
+    and write buffers. APP_RELOAD=1 runs a single auto-reloading process instead.
+    """
+    reload = os.getenv("APP_RELOAD", "0") == "1"
+    workers = 1 if reload else int(os.getenv("APP_WORKERS") or os.cpu_count() or 1)
+
+    uvicorn.run(
+        "src.main:app",
+        host=os.getenv("APP_HOST", "0.0.0.0"),
+        port=int(os.getenv("APP_PORT", "8000")),
+        workers=workers,
+        reload=reload,
+        # In-flight requests get this long to finish before workers are stopped.
+        timeout_graceful_shutdown=int(os.getenv("APP_GRACEFUL_SHUTDOWN", "30")),
+    )
+
+
+if __name__ == "__main__":
+    main()
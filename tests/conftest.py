@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The benchmark scripts import their siblings as top-level modules (PYTHONPATH=src).
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
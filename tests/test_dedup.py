@@ -0,0 +1,147 @@
+import pytest
+
+from src import dedup
+from src.dedup import IngestDeduplicator, IdempotencyKeyMismatch
+from src.influx.models import Event, Utilities
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(dedup.time, "monotonic", clock)
+    return clock
+
+
+def make_events(count: int) -> list:
+    events = [Event(**Utilities.get_random_event_json()) for _ in range(count)]
+    for event in events:
+        Utilities.ensure_event_id(event)
+    return events
+
+
+def retry_of(events: list) -> list:
+    retried = [Event(**event.model_dump(exclude={"id"})) for event in events]
+    for event in retried:
+        Utilities.ensure_event_id(event)
+    return retried
+
+
+def test_retried_events_get_the_same_ids():
+    events = make_events(5)
+
+    assert [event.id for event in retry_of(events)] == [event.id for event in events]
+
+
+def test_different_content_gets_different_ids():
+    event = make_events(1)[0]
+    changed = Event(**event.model_dump(exclude={"id"}) | {"message": event.message + "!"})
+
+    assert Utilities.ensure_event_id(changed) != event.id
+
+
+def test_accepted_events_are_dropped_on_retry(clock):
+    deduplicator = IngestDeduplicator(window=60, capacity=100)
+    events = make_events(5)
+    new_events, duplicates = deduplicator.filter_new(events)
+    deduplicator.accept(new_events)
+
+    retried = retry_of(events[:3]) + make_events(1)
+    new_events, duplicates = deduplicator.filter_new(retried)
+
+    assert duplicates == 3
+    assert new_events == retried[3:]
+    assert deduplicator.stats["duplicates_dropped"] == 3
+
+
+def test_unaccepted_events_are_not_dropped(clock):
+    deduplicator = IngestDeduplicator(window=60, capacity=100)
+    events = make_events(3)
+    deduplicator.filter_new(events)
+
+    # The write failed, so nothing was accepted and the retry must be written.
+    new_events, duplicates = deduplicator.filter_new(retry_of(events))
+
+    assert duplicates == 0
+    assert len(new_events) == 3
+
+
+def test_entries_expire_after_the_window(clock):
+    deduplicator = IngestDeduplicator(window=60, capacity=100)
+    events = make_events(2)
+    deduplicator.accept(events)
+
+    clock.now += 61
+
+    assert deduplicator.filter_new(retry_of(events)) == (retry_of(events), 0)
+    assert not deduplicator.accepted
+
+
+def test_oldest_entries_are_evicted_beyond_capacity(clock):
+    deduplicator = IngestDeduplicator(window=60, capacity=3)
+    events = make_events(5)
+    deduplicator.accept(events)
+
+    assert list(deduplicator.accepted) == [event.id for event in events[2:]]
+
+
+def test_idempotency_key_replays_the_stored_response(clock):
+    deduplicator = IngestDeduplicator(window=60, capacity=100)
+    events = make_events(2)
+    fingerprint = deduplicator.fingerprint(events)
+    response = {"ids": [event.id for event in events]}
+    deduplicator.accept(events, "key-1", fingerprint, response)
+
+    assert deduplicator.replay("key-1", deduplicator.fingerprint(retry_of(events))) == response
+    assert deduplicator.replay("key-2", fingerprint) is None
+    assert deduplicator.replay(None, fingerprint) is None
+    assert deduplicator.stats["idempotent_replays"] == 1
+
+
+def test_idempotency_key_with_a_different_payload_is_rejected(clock):
+    deduplicator = IngestDeduplicator(window=60, capacity=100)
+    events = make_events(2)
+    deduplicator.accept(events, "key-1", deduplicator.fingerprint(events), {"ids": []})
+
+    with pytest.raises(IdempotencyKeyMismatch):
+        deduplicator.replay("key-1", deduplicator.fingerprint(make_events(2)))
+    assert deduplicator.stats["idempotency_key_mismatches"] == 1
+
+
+def test_idempotency_keys_expire_after_the_window(clock):
+    deduplicator = IngestDeduplicator(window=60, capacity=100)
+    events = make_events(1)
+    fingerprint = deduplicator.fingerprint(events)
+    deduplicator.accept(events, "key-1", fingerprint, {"ids": []})
+
+    clock.now += 61
+
+    assert deduplicator.replay("key-1", fingerprint) is None
+
+
+def test_reset_forgets_accepted_events(clock):
+    deduplicator = IngestDeduplicator(window=60, capacity=100)
+    events = make_events(2)
+    deduplicator.accept(events, "key-1", deduplicator.fingerprint(events), {"ids": []})
+
+    deduplicator.reset()
+
+    assert deduplicator.filter_new(events) == (events, 0)
+    assert deduplicator.replay("key-1", deduplicator.fingerprint(events)) is None
+
+
+def test_forget_drops_a_deleted_event(clock):
+    deduplicator = IngestDeduplicator(window=60, capacity=100)
+    events = make_events(2)
+    deduplicator.accept(events)
+
+    deduplicator.forget(events[0].id.lower())
+
+    assert deduplicator.filter_new(retry_of(events)) == ([retry_of(events)[0]], 1)
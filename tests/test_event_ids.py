@@ -0,0 +1,102 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from pydantic import ValidationError
+
+from src.influx.models import Event, Utilities, EVENT_ID_LENGTH, MAX_MESSAGE_LENGTH, MAX_NAME_LENGTH
+
+
+def make_event(**overrides) -> Event:
+    data = Utilities.get_random_event_json()
+    data.update(overrides)
+    return Event(**data)
+
+
+def test_event_id_round_trips_the_millisecond():
+    timestamp = datetime(2025, 1, 15, 10, 0, 0, 123456, tzinfo=timezone.utc)
+    event_id = Utilities.generate_event_id(timestamp)
+
+    assert len(event_id) == EVENT_ID_LENGTH
+    assert Utilities.event_id_timestamp(event_id) == timestamp.replace(microsecond=123000)
+
+
+def test_naive_timestamps_are_utc():
+    timestamp = datetime(2025, 1, 15, 10, 0, 0, 1000)
+    event_id = Utilities.generate_event_id(timestamp)
+
+    assert Utilities.event_id_timestamp(event_id) == timestamp.replace(tzinfo=timezone.utc)
+
+
+def test_event_ids_sort_in_time_order():
+    start = datetime(2025, 1, 15, tzinfo=timezone.utc)
+    ids = [Utilities.generate_event_id(start + timedelta(milliseconds=i)) for i in range(0, 5000, 7)]
+
+    assert ids == sorted(ids)
+
+
+def test_event_ids_in_the_same_millisecond_differ():
+    timestamp = datetime(2025, 1, 15, tzinfo=timezone.utc)
+
+    assert len({Utilities.generate_event_id(timestamp) for _ in range(100)}) == 100
+
+
+@pytest.mark.parametrize("event_id", [
+    "abc",
+    "0" * 25,
+    "U" * EVENT_ID_LENGTH,
+    "8" + "0" * 25,
+    # Decodes past year 9999.
+    "7" + "Z" * 25,
+])
+def test_invalid_event_ids_are_rejected(event_id):
+    with pytest.raises(ValueError):
+        Utilities.event_id_timestamp(event_id)
+
+
+def test_client_event_id_is_uppercased():
+    timestamp = datetime(2025, 1, 15, 10, 0, tzinfo=timezone.utc)
+    event_id = Utilities.generate_event_id(timestamp)
+
+    event = make_event(id=event_id.lower(), timestamp=timestamp.isoformat())
+
+    assert event.id == event_id
+
+
+def test_client_event_id_must_match_the_timestamp():
+    timestamp = datetime(2025, 1, 15, 10, 0, tzinfo=timezone.utc)
+    event_id = Utilities.generate_event_id(timestamp + timedelta(milliseconds=1))
+
+    with pytest.raises(ValidationError):
+        make_event(id=event_id, timestamp=timestamp.isoformat())
+
+
+def test_pre_epoch_timestamps_are_rejected():
+    timestamp = datetime(1960, 1, 1, tzinfo=timezone.utc)
+
+    with pytest.raises(ValueError):
+        Utilities.generate_event_id(timestamp)
+    with pytest.raises(ValidationError):
+        make_event(timestamp=timestamp.isoformat())
+
+
+@pytest.mark.parametrize("overrides", [
+    {"message": "x" * (MAX_MESSAGE_LENGTH + 1)},
+    {"severity": {"name": "x" * (MAX_NAME_LENGTH + 1), "description": ""}},
+])
+def test_values_longer_than_the_database_columns_are_rejected(overrides):
+    with pytest.raises(ValidationError):
+        make_event(**overrides)
+
+
+def test_malformed_client_event_id_is_rejected():
+    with pytest.raises(ValidationError):
+        make_event(id="abc")
+
+
+def test_ensure_event_id_generates_a_matching_id():
+    event = make_event()
+
+    event_id = Utilities.ensure_event_id(event)
+
+    assert Utilities.event_milliseconds(Utilities.event_id_timestamp(event_id)) == \
+        Utilities.event_milliseconds(event.timestamp)
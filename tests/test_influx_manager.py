@@ -0,0 +1,70 @@
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from src.influx.manager import InfluxDBManager
+from src.influx.models import Event, Utilities
+
+
+class StubQueryApi:
+    def __init__(self, results):
+        self.results = list(results)
+        self.queries = []
+
+    def query(self, org, query):
+        self.queries.append(query)
+        record = self.results.pop(0)
+        return [SimpleNamespace(records=[record])] if record is not None else []
+
+
+def make_manager(results) -> InfluxDBManager:
+    query_api = StubQueryApi(results)
+    manager = InfluxDBManager.__new__(InfluxDBManager)
+    manager.client = SimpleNamespace(org="org", query_api=lambda: query_api)
+    manager.bucket = "bucket"
+    manager.event_index = OrderedDict()
+    manager.event_index_size = 10
+    return manager
+
+
+def make_event() -> Event:
+    data = Utilities.get_random_event_json()
+    data["timestamp"] = datetime(2025, 1, 15, 10, 0, 0, 123456, tzinfo=timezone.utc).isoformat()
+    event = Event(**data)
+    Utilities.ensure_event_id(event)
+    return event
+
+
+def test_indexed_event_is_found_with_its_series_tags():
+    event = make_event()
+    manager = make_manager(["record"])
+    manager.index_event(event)
+
+    assert manager.find_event_record(event.id) == "record"
+    query_api = manager.client.query_api()
+    assert len(query_api.queries) == 1
+    assert f'r["severity"] == "{event.severity.name}"' in query_api.queries[0]
+
+
+def test_stale_index_entry_falls_back_to_the_id_window():
+    event = make_event()
+    # The first, exact query misses, e.g. because another worker changed the severity.
+    manager = make_manager([None, "record"])
+    manager.index_event(event)
+
+    assert manager.find_event_record(event.id.lower()) == "record"
+
+    exact_query, window_query = manager.client.query_api().queries
+    assert 'r["severity"]' in exact_query
+    assert 'r["severity"]' not in window_query
+    start = event.timestamp.replace(microsecond=123000)
+    assert f"start: {InfluxDBManager.to_flux_time(start)}" in window_query
+    assert f"stop: {InfluxDBManager.to_flux_time(start + timedelta(milliseconds=1))}" in window_query
+    assert event.id not in manager.event_index
+
+
+def test_missing_event_returns_none():
+    event = make_event()
+    manager = make_manager([None])
+
+    assert manager.find_event_record(event.id) is None
@@ -0,0 +1,121 @@
+import mariadb
+import pytest
+
+from src.influx.models import Event, Utilities
+from src.maria import manager as maria_manager
+from src.maria.manager import MariaDBManager
+
+requires_connector = pytest.mark.skipif(not hasattr(mariadb, "Error"), reason="MariaDB Connector/Python is not installed")
+
+
+class StubInsert:
+    """
+    Stands in for insert_rows, failing the first `failures` calls.
+    """
+
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.written = []
+
+    def __call__(self, rows):
+        if self.failures > 0:
+            self.failures -= 1
+            return False
+        self.written.extend(rows)
+        return True
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    monkeypatch.setenv("MARIADB_WRITE_BATCH_SIZE", "3")
+    monkeypatch.setattr(maria_manager.time, "sleep", lambda seconds: None)
+    return MariaDBManager()
+
+
+def make_event() -> Event:
+    return Event(**Utilities.get_random_event_json())
+
+
+def test_buffered_rows_are_kept_when_a_flush_fails(manager):
+    manager.insert_rows = StubInsert(failures=1)
+    manager.write_event(make_event())
+    manager.write_event(make_event())
+
+    assert not manager.flush()
+    assert len(manager.pending_rows) == 2
+    assert manager.failed_flushes == 1
+
+    assert manager.flush()
+    assert len(manager.insert_rows.written) == 2
+    assert manager.pending_rows == []
+    assert manager.failed_flushes == 0
+
+
+def test_write_that_triggers_a_failed_flush_is_not_kept(manager):
+    manager.insert_rows = StubInsert(failures=1)
+    manager.write_event(make_event())
+    manager.write_event(make_event())
+
+    assert not manager.write_event(make_event())
+    assert len(manager.pending_rows) == 2
+
+
+def test_close_retries_the_flush(manager):
+    manager.insert_rows = StubInsert(failures=2)
+    manager.write_event(make_event())
+
+    manager.close()
+
+    assert len(manager.insert_rows.written) == 1
+    assert manager.pending_rows == []
+
+
+@pytest.mark.parametrize("retries", ["0", "1"])
+def test_close_with_an_empty_buffer_succeeds(manager, retries, monkeypatch):
+    monkeypatch.setenv("MARIADB_WRITE_FLUSH_RETRIES", retries)
+    manager = MariaDBManager()
+    manager.insert_rows = StubInsert(failures=1)
+
+    manager.close()
+
+
+@requires_connector
+def test_close_raises_when_buffered_rows_are_lost(manager):
+    manager.flush_retries = 2
+    manager.insert_rows = StubInsert(failures=2)
+    manager.write_event(make_event())
+
+    with pytest.raises(mariadb.Error):
+        manager.close()
+    assert len(manager.pending_rows) == 1
+
+
+class StubCursor:
+    """
+    Reports rowcount like ON DUPLICATE KEY UPDATE id = id: 1 per inserted row, 0 per duplicate.
+    """
+
+    def __init__(self, inserted: int):
+        self.inserted = inserted
+        self.rowcount = -1
+
+    def executemany(self, statement, rows):
+        self.rowcount = self.inserted
+
+    def close(self):
+        pass
+
+
+def test_duplicate_rows_ignored_accumulates_across_flushes(manager):
+    cursors = iter([StubCursor(inserted=2), StubCursor(inserted=1)])
+    manager.cursor = lambda: next(cursors)
+
+    for _ in range(3):
+        manager.write_event(make_event())
+    assert manager.pending_rows == []
+    assert manager.duplicate_rows_ignored == 1
+
+    manager.write_event(make_event())
+    manager.write_event(make_event())
+    assert manager.flush()
+    assert manager.duplicate_rows_ignored == 2
@@ -0,0 +1,53 @@
+import pytest
+
+from src.report import collect_samples, summarize_samples
+
+
+def test_summary_statistics():
+    summary = summarize_samples(1000, [10.0, 20.0, 30.0, 40.0, 50.0], span_scaled=True)
+
+    assert summary["count"] == 5
+    assert summary["p10"] == pytest.approx(14.0)
+    assert summary["median"] == pytest.approx(30.0)
+    assert summary["p90"] == pytest.approx(46.0)
+    assert summary["mean"] == pytest.approx(30.0)
+    # 1.96 * sample std (15.81) / sqrt(5)
+    assert summary["ci"] == pytest.approx(13.859, abs=1e-3)
+    assert summary["throughput"] == pytest.approx(1000 / 0.030)
+    assert summary["cost"] == pytest.approx(0.030)
+
+
+def test_single_sample_has_no_confidence_interval():
+    assert summarize_samples(10, [7.0], span_scaled=True)["ci"] == 0.0
+
+
+def test_sub_millisecond_medians_keep_derived_metrics_finite():
+    summary = summarize_samples(100, [0.0, 0.0, 0.0], span_scaled=True)
+
+    assert summary["median"] == 0.0
+    assert summary["throughput"] == pytest.approx(100 / 0.0005)
+    assert summary["cost"] == pytest.approx(0.005)
+
+
+def test_operations_not_scaled_by_the_span_have_no_derived_metrics():
+    summary = summarize_samples(1000, [10.0, 20.0], span_scaled=False)
+
+    assert summary["throughput"] is None
+    assert summary["cost"] is None
+
+
+def test_samples_are_pooled_across_result_sets():
+    result_sets = [
+        {"results": [{"backend": "influxdb", "operation": "create", "span": 10, "duration": 2.0, "samples": [1.0, 3.0]}]},
+        {"results": [
+            # Legacy rows without raw samples contribute their duration.
+            {"backend": "influxdb", "operation": "create", "span": 10, "duration": 5.0},
+            # Scaling runs have no span and are not duration sweeps.
+            {"backend": "influxdb", "operation": "scale_ingest", "workers": 2, "requests_per_second": 10.0},
+        ]},
+    ]
+
+    samples = collect_samples(result_sets)
+
+    assert list(samples) == ["create"]
+    assert samples["create"]["influxdb"][10] == [1.0, 3.0, 5.0]
@@ -0,0 +1,65 @@
+import json
+import os
+
+import pytest
+
+from src.results import compare_to_baseline, load_results, save_results
+
+SAMPLE_RESULTS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sample-results")
+
+
+def row(duration: float, operation: str = "create", span: int = 1000, backend: str = "influxdb") -> dict:
+    return {"backend": backend, "operation": operation, "span": span, "duration": duration}
+
+
+def test_legacy_sample_results_are_loaded_as_influxdb_rows():
+    result_set = load_results(SAMPLE_RESULTS)
+
+    assert result_set["metadata"]["scenario"] == "sample-results"
+    rows = [r for r in result_set["results"] if r["operation"] == "create"]
+    assert rows[0] == {"backend": "influxdb", "operation": "create", "span": 1, "duration": 27.0, "samples": [27.0]}
+    assert {r["backend"] for r in result_set["results"]} == {"influxdb"}
+    assert {r["operation"] for r in result_set["results"]} == {
+        "create", "delete", "get_all", "get_country", "get_severity", "update"
+    }
+
+
+def test_saved_runs_load_from_their_directory(tmp_path):
+    metadata = {"scenario": "test", "git_sha": "0123456789abcdef", "started_at": "2025-01-15T10:00:00+00:00"}
+    run_dir = save_results(str(tmp_path), metadata, [row(10.0)])
+
+    assert os.path.basename(run_dir) == "20250115T100000-0123456"
+    assert load_results(run_dir)["results"] == [row(10.0)]
+    with open(os.path.join(run_dir, "results.json")) as file:
+        assert json.load(file)["comparison"] == []
+
+
+def test_directory_without_results_is_an_error(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_results(str(tmp_path))
+
+
+@pytest.mark.parametrize("duration, regression", [
+    (110.0, False),  # exactly at the threshold
+    (111.0, True),
+    (90.0, False),
+])
+def test_regression_threshold(duration, regression):
+    comparison = compare_to_baseline([row(duration)], [row(100.0)], threshold=0.1)
+
+    assert comparison[0]["ratio"] == pytest.approx(duration / 100.0)
+    assert comparison[0]["regression"] is regression
+
+
+def test_small_absolute_slowdowns_are_not_regressions():
+    # 3ms -> 5ms is far above a 10% threshold but only 2ms slower.
+    assert not compare_to_baseline([row(5.0)], [row(3.0)], threshold=0.1, min_delta_ms=5)[0]["regression"]
+    assert compare_to_baseline([row(5.0)], [row(3.0)], threshold=0.1, min_delta_ms=1)[0]["regression"]
+
+
+def test_rows_missing_from_the_baseline_are_skipped():
+    results = [row(10.0), row(10.0, backend="mariadb"), row(10.0, span=5000)]
+
+    comparison = compare_to_baseline(results, [row(10.0)], threshold=0.1)
+
+    assert [(c["backend"], c["span"]) for c in comparison] == [("influxdb", 1000)]